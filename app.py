@@ -3,6 +3,8 @@ from tools.compute_metrics import _compute_metrics, compute_metrics
 from tools.visualize import _plot_price_history, plot_price_history
 from tools.technical_indicators import _plot_sma, _plot_ema, _plot_rsi, _plot_macd, plot_sma, plot_ema, plot_rsi, plot_macd
 from tools.predict_price import _predict_price, predict_price
+from tools.portfolio_analytics import _portfolio_analytics, _summarize_portfolio, _plot_portfolio_risk, analyze_portfolio
+from tools.report_generator import _run_reports_subprocess, _summarize_reports, generate_reports
 from agents import Agent, Runner
 from tools.fetch_stock_data import _fetch_stock_data, fetch_stock_data
 import matplotlib.pyplot as plt
@@ -300,6 +302,49 @@ with st.expander("ℹ️ What do these metrics mean?", expanded=False):
     - **MACD (Moving Average Convergence Divergence)**: Shows the relationship between two EMAs. Used to spot changes in trend.
     """)
 
+# --- Portfolio Analytics ---
+st.markdown("<div class='section-title'>Portfolio Analytics</div>", unsafe_allow_html=True)
+with st.form(key="portfolio_form"):
+    portfolio_tickers = st.text_area("Enter tickers separated by commas, optionally with weights (e.g. AAPL:0.4, MSFT:0.6):", "AAPL, MSFT, GOOG, AMZN")
+    portfolio_period = st.selectbox("Select period:", ["1mo", "3mo", "6mo", "1y"], index=2, key="portfolio_period")
+    portfolio_window = st.number_input("Rolling window (days):", min_value=2, max_value=250, value=20)
+    portfolio_submitted = st.form_submit_button("Analyze Portfolio")
+
+if portfolio_submitted:
+    result = _portfolio_analytics(portfolio_tickers, portfolio_period, int(portfolio_window))
+    if result is None:
+        st.error("Could not compute portfolio analytics. Check the tickers and weights, and make sure the period is longer than the window.")
+    else:
+        st.text(_summarize_portfolio(result))
+        st.pyplot(_plot_portfolio_risk(result))
+
+# --- Batch Reports ---
+st.markdown("<div class='section-title'>Batch Reports</div>", unsafe_allow_html=True)
+with st.form(key="report_form"):
+    report_tickers = st.text_area("Enter tickers separated by commas (one report per ticker):", "AAPL, MSFT, GOOG")
+    report_period = st.selectbox("Select period:", ["1mo", "3mo", "6mo", "1y"], index=2, key="report_period")
+    report_format = st.selectbox("Report format:", ["html", "pdf"])
+    report_dir = st.text_input("Output folder:", "reports")
+    report_submitted = st.form_submit_button("Generate Reports")
+
+if report_submitted:
+    report_bar = st.progress(0.0)
+    report_status = st.empty()
+
+    def show_report_progress(done, total, status):
+        report_bar.progress(done / total)
+        mem = f" (main peak {status['main_rss_mb']:.0f} MB)" if status["main_rss_mb"] is not None else ""
+        report_status.text(f"{done}/{total} — {status['ticker']}: {status['path'] or status['error']}{mem}")
+
+    # Runs in a separate process: a process pool started from this script would
+    # make every worker re-run the whole app
+    results = _run_reports_subprocess(report_tickers, report_period, output_dir=report_dir,
+                                      report_format=report_format, progress=show_report_progress)
+    if results is None:
+        st.error("Could not generate reports. Check the tickers and options.")
+    else:
+        st.text(_summarize_reports(results))
+
 # AI Chat Section
 st.markdown("---")
 st.markdown("<div class='section-title'>Ask the AI Bot</div>", unsafe_allow_html=True)
@@ -311,7 +356,8 @@ if st.button("Ask AI"):
         instructions=(
             "You are a financial research analyst. You have tools to: "
             "fetch raw data, compute metrics, visualize price history, "
-            "and plot technical indicators."
+            "plot technical indicators, analyze the risk of a portfolio "
+            "of several tickers, and generate reports for a list of tickers."
         ),
         tools=[
             fetch_stock_data,
@@ -322,6 +368,8 @@ if st.button("Ask AI"):
             plot_rsi,
             plot_macd,
             predict_price,
+            analyze_portfolio,
+            generate_reports,
         ],
     )
     import asyncio
@@ -9,6 +9,7 @@ from tools.technical_indicators import plot_sma, plot_ema, plot_rsi, plot_macd
 from tools.guardrails import validate_query  
 from agents.exceptions import InputGuardrailTripwireTriggered
 from tools.predict_price import predict_price
+from tools.portfolio_analytics import analyze_portfolio
 
 #API_KEY
 load_dotenv()
@@ -16,7 +17,7 @@ load_dotenv()
 # 1) Prompt
 ticker = input("Enter a stock ticker (e.g. AAPL, TSLA): ").strip()
 action = input(
-    "Choose an action: data, metrics, chart, sma, ema, rsi, macd, predict, or all: "
+    "Choose an action: data, metrics, chart, sma, ema, rsi, macd, predict, portfolio, or all: "
 ).strip().lower()
 
 if action == "data":
@@ -50,6 +51,23 @@ elif action == "macd":
 elif action == "predict":
     period = input("Enter prediction period (1mo, 6mo, 1y): ").strip()
     query = f"Predict the closing price for {ticker} for the next {period}"
+elif action == "portfolio":
+    others = input("Enter the other portfolio tickers, comma-separated (e.g. MSFT,GOOG): ").strip()
+    weights = input("Enter weights in the same order, comma-separated (blank for equal weight): ").strip()
+    period = input("Enter period (e.g. 1mo, 3mo, 6mo, 1y): ").strip()
+    window = input("Enter rolling window (e.g. 20): ").strip()
+    tickers = [ticker] + [t.strip() for t in others.split(",") if t.strip()]
+    if weights:
+        weights = weights.split(",")
+        if len(weights) != len(tickers):
+            print(f"Got {len(weights)} weights for {len(tickers)} tickers. Give a weight for every ticker or for none.")
+            exit(1)
+        tickers = [f"{t}:{w.strip()}" for t, w in zip(tickers, weights)]
+    tickers = ",".join(tickers)
+    query = (
+        f"Analyze the portfolio {tickers} over the last {period} "
+        f"with a {window}-day rolling window"
+    )
 elif action == "all":
     period = input("Enter chart period (e.g. 1mo, 3mo, 6mo, 1y): ").strip()
     query = (
@@ -78,7 +96,8 @@ agent = Agent(
     instructions=(
         "You are a financial research analyst. You have tools to: "
         "fetch raw data, compute metrics, visualize price history, "
-        "and plot technical indicators."
+        "plot technical indicators, and analyze the risk of a portfolio "
+        "of several tickers."
     ),
     tools=[
         fetch_stock_data,
@@ -89,6 +108,7 @@ agent = Agent(
         plot_rsi,
         plot_macd,
         predict_price,
+        analyze_portfolio,
     ],
 )
 
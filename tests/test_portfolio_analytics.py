@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import portfolio_analytics as pa
+
+WINDOW = 20
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(0)
+    # 6 tickers x 80 days, with a constant ticker to exercise zero variance
+    r = rng.normal(0, 0.01, (6, 80))
+    r[5] = 0.0
+    return r
+
+
+def test_rolling_volatility_matches_pandas(returns):
+    expected = pd.DataFrame(returns.T).rolling(WINDOW).std().dropna().to_numpy().T * np.sqrt(pa.TRADING_DAYS)
+    np.testing.assert_allclose(pa._rolling_volatility(returns, WINDOW), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("max_chunk_bytes", [1, 8 * 1024, pa.MAX_CHUNK_BYTES])
+def test_rolling_covariance_matches_pandas(returns, max_chunk_bytes):
+    n_assets, n_days = returns.shape
+    frame = pd.DataFrame(returns.T)
+    expected_cov = frame.rolling(WINDOW).cov().to_numpy().reshape(n_days, n_assets, n_assets)[WINDOW - 1:]
+    expected_corr = frame.rolling(WINDOW).corr().to_numpy().reshape(n_days, n_assets, n_assets)[WINDOW - 1:]
+
+    chunks = list(
+        (start, cov.copy(), corr.copy())
+        for start, cov, corr in pa._iter_rolling_covariance(returns, WINDOW, max_chunk_bytes)
+    )
+    assert [start for start, _, _ in chunks] == sorted(start for start, _, _ in chunks)
+    if max_chunk_bytes < pa.MAX_CHUNK_BYTES:
+        assert len(chunks) > 1
+    cov = np.concatenate([c for _, c, _ in chunks])
+    corr = np.concatenate([c for _, _, c in chunks])
+    np.testing.assert_allclose(cov, expected_cov, atol=1e-15)
+    # pandas leaves the zero-variance ticker's correlations as NaN, as we do
+    np.testing.assert_allclose(corr, expected_corr, atol=1e-12)
+
+
+def test_parse_weighted_tickers():
+    assert pa._parse_weighted_tickers("aapl, MSFT") == (["AAPL", "MSFT"], None)
+    assert pa._parse_weighted_tickers("AAPL:0.2, MSFT: 0.6, AAPL:0.2") == (
+        ["AAPL", "MSFT"], {"AAPL": 0.4, "MSFT": 0.6}
+    )
+    assert pa._parse_weighted_tickers("AAPL:0.4, MSFT") == (None, None)
+    assert pa._parse_weighted_tickers("AAPL:abc") == (None, None)
+    assert pa._parse_weighted_tickers("AAPL:nan, MSFT:1") == (None, None)
+    assert pa._parse_weighted_tickers("AAPL:inf, MSFT:1") == (None, None)
+
+
+def test_short_history_tickers_are_dropped(monkeypatch):
+    rng = np.random.default_rng(1)
+    dates = pd.bdate_range("2024-01-01", periods=120)
+    close = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.01, (120, 3)), axis=0)),
+        index=dates, columns=["AAA", "BBB", "IPO"],
+    )
+    close.iloc[:110, 2] = np.nan
+    monkeypatch.setattr(pa.yf, "download", lambda *a, **k: pd.concat({"Close": close}, axis=1))
+
+    result = pa._portfolio_analytics("AAA:3, BBB:1, IPO:1", "6mo", WINDOW)
+
+    assert result["tickers"] == ["AAA", "BBB"]
+    assert result["missing"] == ["IPO"]
+    assert len(result["dates"]) == 119
+    np.testing.assert_allclose(result["weights"], [0.75, 0.25])
+
+
+def test_non_finite_weight_dict_is_rejected(monkeypatch):
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    close = pd.DataFrame(
+        100 * np.exp(np.cumsum(np.random.default_rng(2).normal(0, 0.01, (60, 2)), axis=0)),
+        index=dates, columns=["AAA", "BBB"],
+    )
+    monkeypatch.setattr(pa.yf, "download", lambda *a, **k: pd.concat({"Close": close}, axis=1))
+
+    assert pa._portfolio_analytics(["AAA", "BBB"], "3mo", WINDOW, weights={"AAA": np.nan, "BBB": 1.0}) is None
+
+
+def test_single_ticker_summary_has_no_pairwise_lines(monkeypatch):
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    close = pd.DataFrame(
+        100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.01, (60, 1)), axis=0)),
+        index=dates, columns=["AAA"],
+    )
+    monkeypatch.setattr(pa.yf, "download", lambda *a, **k: pd.concat({"Close": close}, axis=1))
+
+    summary = pa._summarize_portfolio(pa._portfolio_analytics("AAA", "3mo", WINDOW))
+
+    assert "Correlation" not in summary and "Correlated" not in summary
+    assert "nan" not in summary
@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import report_generator as rg
+from tools import report_worker as rw
+
+HEAVY_MODULES = ("matplotlib.pyplot", "yfinance", "sklearn", "agents")
+
+
+@pytest.fixture
+def hist():
+    dates = pd.bdate_range(end="2026-10-16", periods=1260, tz="America/New_York")
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, len(dates))))
+    return pd.DataFrame({"Open": close, "Close": close, "Volume": 1e6}, index=dates)
+
+
+@pytest.fixture
+def payload(hist):
+    return rg._build_payload("TEST", hist, "3mo", "1mo", "Metrics for TEST:\nP/E Ratio: N/A")
+
+
+@pytest.mark.parametrize("period", list(rg.PERIOD_OFFSETS))
+def test_build_payload_start_slices_period(hist, period):
+    payload = rg._build_payload("TEST", hist, period, "1mo", "")
+    dates = pd.DatetimeIndex(payload["dates"])
+    cutoff = dates[-1] - rg.PERIOD_OFFSETS[period]
+    start = payload["start"]
+    assert dates[start] >= cutoff
+    assert start == 0 or dates[start - 1] < cutoff
+    # Workers get plain arrays and strings, never DataFrames
+    assert isinstance(payload["close"], np.ndarray) and isinstance(payload["dates"], np.ndarray)
+    assert len(payload["close"]) == len(hist)
+    assert payload["predict_days"] == 21
+
+
+def test_render_report_html(payload, tmp_path):
+    status = rw._render_report(payload, str(tmp_path), "html")
+    assert status["error"] is None
+    with open(status["path"], encoding="utf-8") as f:
+        page = f.read()
+    # data, metrics, prediction and all six charts embedded in one file
+    assert "Stock: TEST" in page and "Metrics for TEST" in page and "Predicted Close in 1mo" in page
+    assert page.count("data:image/png;base64,") == 6
+
+
+def test_render_report_pdf(payload, tmp_path):
+    status = rw._render_report(payload, str(tmp_path), "pdf")
+    assert status["error"] is None
+    with open(status["path"], "rb") as f:
+        assert f.read(5) == b"%PDF-"
+
+
+def test_render_report_returns_errors_as_status(payload, tmp_path):
+    status = rw._render_report(payload, str(tmp_path / "missing"), "html")
+    assert status["ticker"] == "TEST"
+    assert status["path"] is None
+    assert status["error"].startswith("Error:")
+
+
+def test_collect_result_records_broken_pool():
+    future = Future()
+    future.set_exception(BrokenProcessPool("worker killed"))
+    status = rg._collect_result(future, "TEST")
+    assert status["ticker"] == "TEST" and status["path"] is None
+    assert "BrokenProcessPool" in status["error"]
+
+
+def test_worker_renders_without_heavy_imports(payload, tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx, initializer=rw._init_worker) as pool:
+        status = pool.submit(rw._render_report, payload, str(tmp_path), "html").result()
+        loaded = pool.submit(eval, f"[m for m in {HEAVY_MODULES!r} if m in __import__('sys').modules]").result()
+    assert os.path.exists(status["path"])
+    assert loaded == []
+
+
+def test_parse_progress_line_ignores_library_output():
+    status = {"ticker": "TEST", "path": "TEST.html", "error": None}
+    line = rg.PROGRESS_PREFIX + '{"done": 1, "total": 2, "status": {"ticker": "TEST", "path": "TEST.html", "error": null}}\n'
+    assert rg._parse_progress_line(line) == {"done": 1, "total": 2, "status": status}
+    assert rg._parse_progress_line("{'error': 'yfinance says hi'}\n") is None
+    assert rg._parse_progress_line(rg.PROGRESS_PREFIX + "{truncated\n") is None
+
+
+def test_subprocess_crash_marks_unreported_tickers(monkeypatch):
+    # Stand-in child: reports one ticker, then dies
+    line = rg.PROGRESS_PREFIX + '{"done": 1, "total": 3, "status": {"ticker": "AAA", "path": "AAA.html", "error": null, "worker_rss_mb": null, "main_rss_mb": null}}'
+    script = f"print({line!r}, flush=True); raise SystemExit(3)"
+    real_popen = rg.subprocess.Popen
+    monkeypatch.setattr(rg.subprocess, "Popen", lambda cmd, **kw: real_popen([sys.executable, "-c", script], **kw))
+    updates = []
+
+    results = rg._run_reports_subprocess("AAA,BBB,CCC", progress=lambda done, total, status: updates.append(done))
+
+    assert [r["ticker"] for r in results] == ["AAA", "BBB", "CCC"]
+    assert results[0]["path"] == "AAA.html"
+    assert all(r["path"] is None and "code 3" in r["error"] for r in results[1:])
+    assert updates == [1, 2, 3]
+    assert rg._summarize_reports(results).startswith("Generated 1 of 3 reports.")
@@ -4,6 +4,9 @@ def _fetch_stock_data(ticker: str) -> str:
     hist = stock.history(period="5d")
     if hist.empty:
         return f"No data found for {ticker}"
+    return _format_latest(ticker, hist)
+
+def _format_latest(ticker: str, hist) -> str:
     latest = hist.iloc[-1]
     return (
         f"Stock: {ticker}\n"
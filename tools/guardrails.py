@@ -20,6 +20,7 @@ async def validate_query(ctx, agent, user_input: str):
         r"Plot the MACD\(\d+,\d+\) and signal\(\d+\) for [A-Z]{1,5} over the last (?:1mo|3mo|6mo|1y)",
         r"Get me the latest stock data and financial metrics for [A-Z]{1,5}, and show me a closing price chart and plot SMA\(20\), EMA\(20\), RSI\(14\), MACD\(12,26,9\) over the last (?:1mo|3mo|6mo|1y)",
         r"Predict the closing price for [A-Z]{1,5} for the next (?:1mo|6mo|1y)",
+        r"Analyze the portfolio [A-Z]{1,5}(?::\d*\.?\d+)?(?:,[A-Z]{1,5}(?::\d*\.?\d+)?)+ over the last (?:1mo|3mo|6mo|1y) with a \d+-day rolling window",
     ]
     for pat in patterns:
         if re.fullmatch(pat, user_input):
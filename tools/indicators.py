@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+# Pure NumPy/pandas indicator math, kept free of pyplot, yfinance and sklearn so
+# headless report workers can import it cheaply.
+
+def _sma(close: pd.Series, window: int) -> pd.Series:
+    return close.rolling(window=window).mean()
+
+def _ema(close: pd.Series, span: int) -> pd.Series:
+    return close.ewm(span=span, adjust=False).mean()
+
+def _rsi(close: pd.Series, window: int) -> pd.Series:
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+    avg_gain = gain.rolling(window=window).mean()
+    avg_loss = loss.rolling(window=window).mean()
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+def _macd(close: pd.Series, fast_span: int, slow_span: int, signal_span: int):
+    macd = _ema(close, fast_span) - _ema(close, slow_span)
+    signal = macd.ewm(span=signal_span, adjust=False).mean()
+    return macd, signal
+
+def _linear_forecast(close, pred_days: int):
+    # Least-squares fit of Close against day number, extrapolated pred_days ahead
+    close = np.asarray(close, dtype=np.float64)
+    slope, intercept = np.polyfit(np.arange(len(close)), close, 1)
+    return intercept + slope * np.arange(len(close), len(close) + pred_days)
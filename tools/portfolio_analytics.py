@@ -0,0 +1,255 @@
+import re
+import yfinance as yf
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
+from agents.tool import function_tool
+from tools.utils import _parse_tickers
+
+TRADING_DAYS = 252
+# Upper bound for the per-chunk working set of the rolling covariance.
+# 256 MB keeps ~40 rolling windows of a 500-ticker, 20-day-window universe per chunk.
+MAX_CHUNK_BYTES = 256 * 1024 * 1024
+
+
+def _parse_weighted_tickers(text: str):
+    """
+    Parses "AAPL, MSFT" or "AAPL:0.4, MSFT:0.6" into (tickers, weights), where weights
+    is a {ticker: weight} dict or None for equal weights. A repeated ticker adds up its
+    weights. Returns (None, None) if the weights are malformed or only partly given.
+    """
+    entries = re.split(r"[,;\s]+", re.sub(r"\s*:\s*", ":", text).strip())
+    tickers, weights = [], {}
+    for entry in filter(None, entries):
+        ticker, _, weight = entry.partition(":")
+        ticker = ticker.upper()
+        if ticker not in tickers:
+            tickers.append(ticker)
+        if weight:
+            try:
+                value = float(weight)
+            except ValueError:
+                value = np.nan
+            # float() accepts "nan" and "inf", which would poison every normalized weight
+            if not np.isfinite(value):
+                print(f"Invalid weight for {ticker}: {weight}")
+                return None, None
+            weights[ticker] = weights.get(ticker, 0.0) + value
+    if weights and len(weights) != len(tickers):
+        print("Give a weight for every ticker or for none.")
+        return None, None
+    return tickers, weights or None
+
+
+def _fetch_close_matrix(tickers, period: str, min_obs: int = 2):
+    # One batched download for the whole universe instead of one request per ticker
+    data = yf.download(tickers, period=period, auto_adjust=True, progress=False)
+    if data.empty:
+        return None, [], None
+    close = data["Close"]
+    if isinstance(close, pd.Series):
+        close = close.to_frame(tickers[0])
+    # Drop tickers with fewer than min_obs closes first (recent IPOs, sparse listings) so they
+    # don't cut the history short for everyone, then keep the dates every remaining ticker traded on
+    close = close.reindex(columns=tickers)
+    close = close.loc[:, close.count() >= min_obs].dropna(axis=0, how="any")
+    if close.empty:
+        return None, [], None
+    # tickers x days
+    return close.index, list(close.columns), close.to_numpy(dtype=np.float64).T
+
+
+def _log_returns(prices: np.ndarray) -> np.ndarray:
+    return np.diff(np.log(prices), axis=1)
+
+
+def _rolling_volatility(returns: np.ndarray, window: int) -> np.ndarray:
+    # Running sums give every window's variance in O(N x T) instead of O(N x T x window)
+    padded = np.pad(returns, ((0, 0), (1, 0)))
+    s1 = np.cumsum(padded, axis=1)
+    s2 = np.cumsum(padded ** 2, axis=1)
+    win_sum = s1[:, window:] - s1[:, :-window]
+    win_sq = s2[:, window:] - s2[:, :-window]
+    var = (win_sq - win_sum ** 2 / window) / (window - 1)
+    return np.sqrt(np.clip(var, 0.0, None) * TRADING_DAYS)
+
+
+def _iter_rolling_covariance(returns: np.ndarray, window: int, max_chunk_bytes: int = MAX_CHUNK_BYTES):
+    """
+    Yields (start, cov, corr) for consecutive chunks of rolling windows.
+    cov and corr have shape (chunk, N, N); start is the index of the first window
+    in the chunk. Chunks are sized so each chunk's working set stays under
+    max_chunk_bytes; callers should copy anything they keep, since the blocks are
+    released before the next chunk is built.
+    """
+    n_assets = returns.shape[0]
+    # (N, n_windows, window) view over the returns, no copy
+    windows = sliding_window_view(returns, window, axis=1)
+    n_windows = windows.shape[1]
+    # cov, denom and corr float blocks, the denom > 0 mask and the demeaned copy of the windows
+    per_window = 8 * (3 * n_assets * n_assets + n_assets * window) + n_assets * n_assets
+    chunk = max(1, max_chunk_bytes // per_window)
+    for start in range(0, n_windows, chunk):
+        block = windows[:, start:start + chunk, :].transpose(1, 0, 2)
+        demeaned = block - block.mean(axis=2, keepdims=True)
+        # Batched matmul: one BLAS call per window instead of N^2 pairwise calls
+        cov = demeaned @ demeaned.transpose(0, 2, 1) / (window - 1)
+        std = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+        denom = std[:, :, None] * std[:, None, :]
+        corr = np.divide(cov, denom, out=np.full_like(cov, np.nan), where=denom > 0)
+        del denom
+        yield start, cov, corr
+        # Drop this chunk before building the next so two chunks are never alive at once
+        del block, demeaned, cov, std, corr
+
+
+def _portfolio_analytics(tickers, period: str = "6mo", window: int = 20, weights=None):
+    # weights is a {ticker: weight} dict; a string of tickers may also carry them inline
+    if isinstance(tickers, str):
+        tickers, parsed_weights = _parse_weighted_tickers(tickers)
+        if tickers is None:
+            return None
+        weights = weights if weights is not None else parsed_weights
+    else:
+        tickers = _parse_tickers(tickers)
+    if not tickers:
+        print("No tickers given.")
+        return None
+    if window < 2:
+        print("Window must be at least 2 days.")
+        return None
+    dates, kept, prices = _fetch_close_matrix(tickers, period, min_obs=window + 1)
+    if prices is None:
+        print(f"Not enough data for a {window}-day window for {', '.join(tickers)} in period '{period}'")
+        return None
+    returns = _log_returns(prices)
+    n_assets, n_days = returns.shape
+    if n_days < window:
+        print(f"Not enough overlapping data for a {window}-day window in period '{period}'")
+        return None
+
+    if weights is None:
+        w = np.full(n_assets, 1.0 / n_assets)
+    else:
+        # Tickers dropped for missing data lose their weight; the rest are renormalized
+        lookup = {t.upper(): float(v) for t, v in weights.items()}
+        w = np.array([lookup.get(t, 0.0) for t in kept])
+        if not np.isfinite(w).all():
+            print("Weights must be finite numbers.")
+            return None
+        if w.sum() <= 0:
+            print("Weights must sum to a positive number.")
+            return None
+        w = w / w.sum()
+
+    vol = _rolling_volatility(returns, window)
+    n_windows = vol.shape[1]
+    port_vol = np.empty(n_windows)
+    avg_corr = np.full(n_windows, np.nan)
+    for start, cov, corr in _iter_rolling_covariance(returns, window):
+        stop = start + cov.shape[0]
+        port_var = np.einsum("i,cij,j->c", w, cov, w)
+        port_vol[start:stop] = np.sqrt(np.clip(port_var, 0.0, None) * TRADING_DAYS)
+        if n_assets > 1:
+            # Sum of the correlation matrix straight from cov, without a nan-filled temporary
+            std = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+            inv_std = np.divide(1.0, std, out=np.zeros_like(std), where=std > 0)
+            valid = np.count_nonzero(std > 0, axis=1)
+            total = np.einsum("ci,cij,cj->c", inv_std, cov, inv_std)
+            pairs = valid * (valid - 1)
+            avg_corr[start:stop] = np.divide(total - valid, pairs, out=np.full(len(pairs), np.nan), where=pairs > 0)
+        # Copies, so the chunk itself can be freed
+        last_cov, last_corr = cov[-1].copy(), corr[-1].copy()
+        del cov, corr
+
+    port_returns = w @ returns
+    latest_port_vol = port_vol[-1]
+    return {
+        "tickers": kept,
+        "missing": [t for t in tickers if t not in kept],
+        "period": period,
+        "window": window,
+        "weights": w,
+        "dates": dates[1:],
+        "window_dates": dates[window:],
+        "returns": returns,
+        "rolling_volatility": vol,
+        "portfolio_volatility": port_vol,
+        "average_correlation": avg_corr,
+        "covariance": last_cov * TRADING_DAYS,
+        "correlation": last_corr,
+        "annual_return": port_returns.mean() * TRADING_DAYS,
+        "annual_volatility": port_returns.std(ddof=1) * np.sqrt(TRADING_DAYS),
+        "diversification_ratio": (w @ vol[:, -1]) / latest_port_vol if latest_port_vol > 0 else np.nan,
+    }
+
+
+def _summarize_portfolio(result, top_n: int = 5) -> str:
+    tickers = result["tickers"]
+    lines = [
+        f"Portfolio: {', '.join(tickers)}",
+        f"Period: {result['period']}, rolling window: {result['window']} days",
+    ]
+    if result["missing"]:
+        lines.append(f"Not enough data for: {', '.join(result['missing'])}")
+    lines += [
+        f"Annualized Return: {result['annual_return']:.2%}",
+        f"Annualized Volatility: {result['annual_volatility']:.2%}",
+        f"Latest Rolling Volatility: {result['portfolio_volatility'][-1]:.2%}",
+    ]
+    if len(tickers) > 1:
+        lines.append(f"Average Pairwise Correlation: {result['average_correlation'][-1]:.2f}")
+    lines.append(f"Diversification Ratio: {result['diversification_ratio']:.2f}")
+    w = result["weights"]
+    if not np.allclose(w, w[0]):
+        lines.append("Largest Weights:")
+        for i in np.argsort(w)[::-1][:top_n]:
+            lines.append(f"  {tickers[i]}: {w[i]:.2%}")
+    vol = result["rolling_volatility"][:, -1]
+    lines.append("Rolling Volatility by Ticker:")
+    for i in np.argsort(vol)[::-1][:top_n]:
+        lines.append(f"  {tickers[i]}: {vol[i]:.2%}")
+    if len(tickers) > 1:
+        corr = result["correlation"]
+        rows, cols = np.triu_indices(len(tickers), k=1)
+        pair_corr = np.nan_to_num(corr[rows, cols], nan=-np.inf)
+        lines.append("Most Correlated Pairs:")
+        for k in np.argsort(pair_corr)[::-1][:top_n]:
+            lines.append(f"  {tickers[rows[k]]}/{tickers[cols[k]]}: {corr[rows[k], cols[k]]:.2f}")
+    return "\n".join(lines)
+
+
+def _plot_portfolio_risk(result):
+    tickers = result["tickers"]
+    fig, (ax_vol, ax_corr) = plt.subplots(1, 2, figsize=(14, 5))
+    ax_vol.plot(result["window_dates"], result["portfolio_volatility"], label="Portfolio Volatility")
+    ax_vol.set_title(f"Rolling {result['window']}-Day Risk — Last {result['period']}")
+    ax_vol.set_xlabel("Date")
+    ax_vol.set_ylabel("Annualized Volatility")
+    ax_vol.grid(True)
+    ax_avg = ax_vol.twinx()
+    ax_avg.plot(result["window_dates"], result["average_correlation"], color="orange", label="Avg Correlation")
+    ax_avg.set_ylabel("Average Correlation")
+    handles = ax_vol.get_legend_handles_labels()[0] + ax_avg.get_legend_handles_labels()[0]
+    ax_vol.legend(handles=handles)
+    im = ax_corr.imshow(result["correlation"], cmap="RdBu_r", vmin=-1, vmax=1)
+    ax_corr.set_title("Correlation — Latest Window")
+    # Tick labels become unreadable for large universes
+    if len(tickers) <= 30:
+        ax_corr.set_xticks(range(len(tickers)))
+        ax_corr.set_xticklabels(tickers, rotation=90)
+        ax_corr.set_yticks(range(len(tickers)))
+        ax_corr.set_yticklabels(tickers)
+    fig.colorbar(im, ax=ax_corr)
+    fig.tight_layout()
+    return fig
+
+
+@function_tool
+def analyze_portfolio(tickers: str, period: str = "6mo", window: int = 20) -> str:
+    """Tickers are comma-separated, optionally weighted like "AAPL:0.4,MSFT:0.6" (equal weight otherwise)."""
+    result = _portfolio_analytics(tickers, period, window)
+    if result is None:
+        return f"Could not compute portfolio analytics for {tickers} over the last {period}"
+    return _summarize_portfolio(result)
@@ -1,18 +1,18 @@
 import yfinance as yf
-import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
 from datetime import timedelta
 from agents.tool import function_tool
+from tools.indicators import _linear_forecast
+
+# Map period to number of days
+PREDICTION_DAYS = {"1mo": 21, "6mo": 126, "1y": 252}  # trading days
 
 def _predict_price(ticker: str, period: str = "1mo"):
-    # Map period to number of days
-    period_map = {"1mo": 21, "6mo": 126, "1y": 252}  # trading days
-    if period not in period_map:
+    if period not in PREDICTION_DAYS:
         print("Invalid period. Choose from: 1mo, 6mo, 1y.")
         return None
-    pred_days = period_map[period]
+    pred_days = PREDICTION_DAYS[period]
     # Fetch historical data (last 5 years)
     stock = yf.Ticker(ticker)
     hist = stock.history(period="5y")
@@ -21,18 +21,8 @@ def _predict_price(ticker: str, period: str = "1mo"):
         return None
     hist = hist.dropna(subset=["Close"]).copy()
     hist.reset_index(inplace=True)
-    # Prepare data for regression
-    hist["Day"] = np.arange(len(hist))
-    X = hist[["Day"]].values
-    y = hist["Close"].values
-    # Train linear regression
-    model = LinearRegression()
-    model.fit(X, y)
-    # Predict future days
-    last_day = hist["Day"].iloc[-1]
-    future_days = np.arange(last_day + 1, last_day + pred_days + 1)
-    X_future = future_days.reshape(-1, 1)
-    y_pred = model.predict(X_future)
+    # Train linear regression and predict future days
+    y_pred = _linear_forecast(hist["Close"].values, pred_days)
     # Build future dates
     last_date = hist["Date"].iloc[-1]
     freq = pd.infer_freq(hist["Date"])
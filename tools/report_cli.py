@@ -0,0 +1,8 @@
+import sys
+
+# Entry point for batch reports: python -m tools.report_cli AAPL MSFT ...
+# Spawned report workers re-import the __main__ module, so this stays tiny and
+# only pulls in the heavy report_generator imports when actually run.
+if __name__ == "__main__":
+    from tools.report_generator import _main
+    sys.exit(_main())
@@ -0,0 +1,265 @@
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+
+import yfinance as yf
+import numpy as np
+import pandas as pd
+from agents.tool import function_tool
+
+from tools.compute_metrics import _compute_metrics
+from tools.fetch_stock_data import _format_latest
+from tools.predict_price import PREDICTION_DAYS
+from tools.report_worker import _init_worker, _peak_rss_mb, _render_report
+from tools.utils import _parse_tickers
+
+REPORT_FORMATS = ("html", "pdf")
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+}
+# Tickers downloaded per yfinance call; also bounds how much history sits in the main process
+BATCH_SIZE = 50
+# yfinance .info lookups are network bound, so plain threads are fine for them
+METRICS_THREADS = 8
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Marks progress lines in the report CLI's output, which also carries library chatter
+PROGRESS_PREFIX = "REPORT_PROGRESS "
+
+
+def _fetch_history_batch(tickers):
+    data = yf.download(tickers, period="5y", auto_adjust=True, progress=False, group_by="ticker")
+    histories = {}
+    if data.empty:
+        return histories
+    for t in tickers:
+        if isinstance(data.columns, pd.MultiIndex):
+            if t not in data.columns.get_level_values(0):
+                continue
+            hist = data[t]
+        else:
+            hist = data
+        hist = hist.dropna(subset=["Close"])
+        if not hist.empty:
+            histories[t] = hist
+    return histories
+
+
+def _safe_compute_metrics(ticker: str) -> str:
+    try:
+        return _compute_metrics(ticker)
+    except Exception as e:
+        return f"Metrics for {ticker}: unavailable ({e})"
+
+
+def _build_payload(ticker, hist, period, predict_period, metrics_text):
+    index = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+    # Plain NumPy arrays and strings pickle far smaller than a DataFrame
+    return {
+        "ticker": ticker,
+        "period": period,
+        "predict_period": predict_period,
+        "predict_days": PREDICTION_DAYS[predict_period],
+        "dates": index.values.astype("datetime64[D]"),
+        "close": hist["Close"].to_numpy(dtype=np.float64),
+        "start": int(index.searchsorted(index[-1] - PERIOD_OFFSETS[period])),
+        "data_text": _format_latest(ticker, hist),
+        "metrics_text": metrics_text,
+    }
+
+
+def _print_progress(done: int, total: int, status):
+    outcome = status["path"] or status["error"]
+    mem = ""
+    if status["worker_rss_mb"] is not None:
+        mem += f" worker peak {status['worker_rss_mb']:.0f} MB"
+    if status["main_rss_mb"] is not None:
+        mem += f" main peak {status['main_rss_mb']:.0f} MB"
+    print(f"[{done}/{total}] {status['ticker']}: {outcome}{mem}")
+
+
+def _valid_report_options(tickers, period: str, predict_period: str, report_format: str) -> bool:
+    if not tickers:
+        print("No tickers given.")
+        return False
+    if period not in PERIOD_OFFSETS:
+        print("Invalid period. Choose from: 1mo, 3mo, 6mo, 1y.")
+        return False
+    if predict_period not in PREDICTION_DAYS:
+        print("Invalid prediction period. Choose from: 1mo, 6mo, 1y.")
+        return False
+    if report_format not in REPORT_FORMATS:
+        print("Invalid report format. Choose from: html, pdf.")
+        return False
+    return True
+
+
+def _generate_reports(tickers, period: str = "6mo", predict_period: str = "1mo", output_dir: str = "reports",
+                      report_format: str = "html", workers=None, progress=None):
+    """
+    Writes one self-contained report per ticker into output_dir and returns a list of
+    status dicts (ticker, path, error, worker_rss_mb, main_rss_mb). Charts are rendered
+    in a pool of headless worker processes; progress(done, total, status) is called as
+    each ticker finishes.
+    """
+    tickers = _parse_tickers(tickers)
+    if not _valid_report_options(tickers, period, predict_period, report_format):
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+    if progress is None:
+        progress = _print_progress
+
+    results = []
+
+    def record(status):
+        status["main_rss_mb"] = _peak_rss_mb()
+        results.append(status)
+        progress(len(results), len(tickers), status)
+
+    # spawn keeps workers free of any pyplot state already set up in this process.
+    # Workers re-import the launching __main__ module, so run this from tools.report_cli
+    # (or another lightweight entry point) rather than from a heavy script.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker) as pool, \
+            ThreadPoolExecutor(max_workers=METRICS_THREADS) as io_pool:
+        pending = {}
+        for i in range(0, len(tickers), BATCH_SIZE):
+            batch = tickers[i:i + BATCH_SIZE]
+            # Workers keep rendering the previous batch while this one downloads
+            histories = _fetch_history_batch(batch)
+            found = [t for t in batch if t in histories]
+            metrics = dict(zip(found, io_pool.map(_safe_compute_metrics, found)))
+            for t in batch:
+                if t not in histories:
+                    record({"ticker": t, "path": None, "error": f"No data found for {t}", "worker_rss_mb": None})
+                    continue
+                payload = _build_payload(t, histories[t], period, predict_period, metrics[t])
+                try:
+                    pending[pool.submit(_render_report, payload, output_dir, report_format)] = t
+                except Exception as e:  # the pool is already broken
+                    record(_failed_status(t, e))
+            done, _ = wait(pending, timeout=0)
+            for future in done:
+                record(_collect_result(future, pending.pop(future)))
+        for future in as_completed(pending):
+            record(_collect_result(future, pending[future]))
+    return results
+
+
+def _failed_status(ticker: str, error):
+    return {"ticker": ticker, "path": None, "error": f"Error: {error!r}", "worker_rss_mb": None}
+
+
+def _collect_result(future, ticker: str):
+    # _render_report catches its own errors, but a worker killed by the OS (e.g. out of
+    # memory) breaks the pool and every pending result() raises BrokenProcessPool
+    try:
+        return future.result()
+    except Exception as e:
+        return _failed_status(ticker, e)
+
+
+def _json_progress(done: int, total: int, status):
+    # One line per ticker for _run_reports_subprocess to parse as it arrives
+    print(PROGRESS_PREFIX + json.dumps({"done": done, "total": total, "status": status}), flush=True)
+
+
+def _parse_progress_line(line: str):
+    if not line.startswith(PROGRESS_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(PROGRESS_PREFIX):])
+    except json.JSONDecodeError:
+        return None
+
+
+def _run_reports_subprocess(tickers, period: str = "6mo", predict_period: str = "1mo", output_dir: str = "reports",
+                            report_format: str = "html", workers=None, progress=None):
+    """
+    Same as _generate_reports, but runs the job in a separate `python -m tools.report_cli`
+    process. Use this from Streamlit or any other long-lived script: spawned pool workers
+    re-import the launching __main__ module, which would re-run the whole script.
+    """
+    tickers = _parse_tickers(tickers)
+    # Validate here so a non-zero exit from the child always means the job itself failed
+    if not _valid_report_options(tickers, period, predict_period, report_format):
+        return None
+    cmd = [
+        sys.executable, "-m", "tools.report_cli", ",".join(tickers),
+        "--period", period, "--predict-period", predict_period,
+        "--format", report_format, "--output", os.path.abspath(output_dir), "--json-progress",
+    ]
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
+    if progress is None:
+        progress = _print_progress
+    results = []
+    with subprocess.Popen(cmd, cwd=PROJECT_ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          text=True, bufsize=1) as proc:
+        for line in proc.stdout:
+            update = _parse_progress_line(line)
+            # Anything that is not a progress line is library or error output
+            if update is None:
+                print(line, end="")
+                continue
+            results.append(update["status"])
+            progress(update["done"], update["total"], update["status"])
+    # If the child died part way, account for every ticker it never reported on
+    reported = {r["ticker"] for r in results}
+    for t in tickers:
+        if t not in reported:
+            status = {"ticker": t, "path": None, "worker_rss_mb": None, "main_rss_mb": None,
+                      "error": f"Error: report process exited with code {proc.returncode} before this ticker finished"}
+            results.append(status)
+            progress(len(results), len(tickers), status)
+    return results
+
+
+def _summarize_reports(results) -> str:
+    written = [r for r in results if r["path"]]
+    lines = [f"Generated {len(written)} of {len(results)} reports."]
+    lines += [f"  {r['ticker']}: {r['path']}" for r in written]
+    failed = [r for r in results if not r["path"]]
+    if failed:
+        lines.append("Failed:")
+        lines += [f"  {r['ticker']}: {r['error']}" for r in failed]
+    return "\n".join(lines)
+
+
+@function_tool
+def generate_reports(tickers: str, period: str = "6mo", report_format: str = "html") -> str:
+    results = _run_reports_subprocess(tickers, period, report_format=report_format)
+    if results is None:
+        return f"Could not generate reports for {tickers} over the last {period}"
+    return _summarize_reports(results)
+
+
+def _main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate one report per ticker.")
+    parser.add_argument("tickers", nargs="*", help="Tickers, e.g. AAPL MSFT GOOG")
+    parser.add_argument("--tickers-file", help="File with tickers separated by commas or newlines")
+    parser.add_argument("--period", default="6mo", choices=list(PERIOD_OFFSETS))
+    parser.add_argument("--predict-period", default="1mo", choices=list(PREDICTION_DAYS))
+    parser.add_argument("--format", dest="report_format", default="html", choices=REPORT_FORMATS)
+    parser.add_argument("--output", default="reports")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json-progress", action="store_true", help="Print progress as one JSON object per line")
+    args = parser.parse_args(argv)
+    tickers = ",".join(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += "," + f.read().replace("\n", ",")
+    progress = _json_progress if args.json_progress else None
+    results = _generate_reports(tickers, args.period, args.predict_period, args.output,
+                                args.report_format, args.workers, progress)
+    if results is None:
+        return 1
+    if not args.json_progress:
+        print(_summarize_reports(results))
+    return 0
@@ -0,0 +1,149 @@
+# Everything the report worker processes need. Unpickling _render_report imports this
+# module in every worker, so it must stay free of pyplot, yfinance, sklearn and agents.
+import base64
+import html
+import io
+import os
+import sys
+from datetime import timedelta
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+from tools.indicators import _sma, _ema, _rsi, _macd, _linear_forecast
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+
+
+def _new_axes(figsize=(10, 5)):
+    # Figure objects are independent of pyplot's global state
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+def _build_figures(payload):
+    ticker, period = payload["ticker"], payload["period"]
+    close = pd.Series(payload["close"], index=pd.DatetimeIndex(payload["dates"]))
+    # Indicators use the full history so the period starts without a warm-up gap
+    view = slice(payload["start"], None)
+    shown = close.iloc[view]
+    figures = []
+
+    fig, ax = _new_axes()
+    ax.plot(shown.index, shown, marker="o", linestyle="-")
+    ax.set_title(f"{ticker} Closing Prices — Last {period}")
+    ax.set_ylabel("Price (USD)")
+    figures.append(fig)
+
+    for name, line in (("SMA", _sma(close, 20)), ("EMA", _ema(close, 20))):
+        fig, ax = _new_axes()
+        ax.plot(shown.index, shown, label="Close")
+        ax.plot(shown.index, line.iloc[view], label=f"{name} 20")
+        ax.set_title(f"{ticker} Close and {name}(20) — Last {period}")
+        ax.set_ylabel("Price (USD)")
+        ax.legend()
+        figures.append(fig)
+
+    fig, ax = _new_axes(figsize=(10, 3))
+    ax.plot(shown.index, _rsi(close, 14).iloc[view], label="RSI")
+    ax.axhline(70, color="red", linestyle="--")
+    ax.axhline(30, color="green", linestyle="--")
+    ax.set_title(f"{ticker} RSI(14) — Last {period}")
+    ax.set_ylabel("RSI")
+    figures.append(fig)
+
+    macd, signal = _macd(close, 12, 26, 9)
+    fig, ax = _new_axes()
+    ax.plot(shown.index, macd.iloc[view], label="MACD")
+    ax.plot(shown.index, signal.iloc[view], label="Signal")
+    ax.set_title(f"{ticker} MACD(12,26) & Signal(9) — Last {period}")
+    ax.set_ylabel("Value")
+    ax.legend()
+    figures.append(fig)
+
+    predict_period = payload["predict_period"]
+    y_pred = _linear_forecast(payload["close"], payload["predict_days"])
+    future_dates = pd.bdate_range(start=close.index[-1] + timedelta(days=1), periods=len(y_pred))
+    fig, ax = _new_axes(figsize=(12, 6))
+    ax.plot(close.index, close, label="Historical Close")
+    ax.plot(future_dates, y_pred, label=f"Predicted Close ({predict_period})", linestyle="--")
+    ax.set_title(f"{ticker} Price Prediction — Next {predict_period}")
+    ax.set_ylabel("Price (USD)")
+    ax.legend()
+    figures.append(fig)
+
+    for fig in figures:
+        ax = fig.axes[0]
+        ax.set_xlabel("Date")
+        ax.grid(True)
+        fig.tight_layout()
+    prediction = f"Predicted Close in {predict_period}: {y_pred[-1]:.2f}"
+    return figures, prediction
+
+
+def _write_html(path, payload, figures, prediction):
+    images = []
+    for fig in figures:
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=100)
+        images.append(base64.b64encode(buf.getvalue()).decode("ascii"))
+    sections = "\n".join(
+        f"<img src='data:image/png;base64,{img}' style='max-width:100%;'/>" for img in images
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(payload['ticker'])} Report</title></head>\n"
+            "<body style='font-family:sans-serif;max-width:1000px;margin:auto;'>\n"
+            f"<h1>{html.escape(payload['ticker'])} — Last {html.escape(payload['period'])}</h1>\n"
+            f"<h2>Latest Data</h2><pre>{html.escape(payload['data_text'])}</pre>\n"
+            f"<h2>Key Metrics</h2><pre>{html.escape(payload['metrics_text'])}</pre>\n"
+            f"<h2>Prediction</h2><pre>{html.escape(prediction)}</pre>\n"
+            f"<h2>Charts</h2>\n{sections}\n"
+            "</body></html>\n"
+        )
+
+
+def _write_pdf(path, payload, figures, prediction):
+    from matplotlib.backends.backend_pdf import PdfPages
+    summary = Figure(figsize=(8.5, 11))
+    summary.text(
+        0.08, 0.92,
+        f"{payload['ticker']} — Last {payload['period']}\n\n"
+        f"{payload['data_text']}\n{payload['metrics_text']}\n\n{prediction}",
+        va="top", family="monospace", fontsize=11,
+    )
+    with PdfPages(path) as pdf:
+        pdf.savefig(summary)
+        for fig in figures:
+            pdf.savefig(fig)
+
+
+def _render_report(payload, output_dir: str, report_format: str):
+    ticker = payload["ticker"]
+    path = os.path.join(output_dir, f"{ticker}.{report_format}")
+    try:
+        figures, prediction = _build_figures(payload)
+        if report_format == "pdf":
+            _write_pdf(path, payload, figures, prediction)
+        else:
+            _write_html(path, payload, figures, prediction)
+    except Exception as e:
+        return {"ticker": ticker, "path": None, "error": f"Error: {e}", "worker_rss_mb": _peak_rss_mb()}
+    return {"ticker": ticker, "path": path, "error": None, "worker_rss_mb": _peak_rss_mb()}
@@ -2,13 +2,14 @@ import yfinance as yf
 import pandas as pd
 import matplotlib.pyplot as plt
 from agents.tool import function_tool
+from tools.indicators import _sma, _ema, _rsi, _macd
 
 def _plot_sma(ticker: str, period: str, window: int):
     data = yf.Ticker(ticker).history(period=period)
     if data.empty:
         print(f"No data for {ticker} in period '{period}'")
         return None
-    sma = data['Close'].rolling(window=window).mean()
+    sma = _sma(data['Close'], window)
     fig, ax = plt.subplots(figsize=(10,5))
     ax.plot(data.index, data['Close'], label='Close')
     ax.plot(data.index, sma, label=f'SMA {window}')
@@ -29,7 +30,7 @@ def _plot_ema(ticker: str, period: str, span: int):
     if data.empty:
         print(f"No data for {ticker} in period '{period}'")
         return None
-    ema = data['Close'].ewm(span=span, adjust=False).mean()
+    ema = _ema(data['Close'], span)
     fig, ax = plt.subplots(figsize=(10,5))
     ax.plot(data.index, data['Close'], label='Close')
     ax.plot(data.index, ema, label=f'EMA {span}')
@@ -50,13 +51,7 @@ def _plot_rsi(ticker: str, period: str, window: int):
     if data.empty:
         print(f"No data for {ticker} in period '{period}'")
         return None
-    delta = data['Close'].diff()
-    gain = delta.where(delta > 0, 0.0)
-    loss = -delta.where(delta < 0, 0.0)
-    avg_gain = gain.rolling(window=window).mean()
-    avg_loss = loss.rolling(window=window).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
+    rsi = _rsi(data['Close'], window)
     fig, ax = plt.subplots(figsize=(10,3))
     ax.plot(data.index, rsi, label='RSI')
     ax.axhline(70, color='red', linestyle='--')
@@ -77,10 +72,7 @@ def _plot_macd(ticker: str, period: str, fast_span: int, slow_span: int, signal_
     if data.empty:
         print(f"No data for {ticker} in period '{period}'")
         return None
-    fast_ema = data['Close'].ewm(span=fast_span, adjust=False).mean()
-    slow_ema = data['Close'].ewm(span=slow_span, adjust=False).mean()
-    macd = fast_ema - slow_ema
-    signal = macd.ewm(span=signal_span, adjust=False).mean()
+    macd, signal = _macd(data['Close'], fast_span, slow_span, signal_span)
     fig, ax = plt.subplots(figsize=(10,5))
     ax.plot(data.index, macd, label='MACD')
     ax.plot(data.index, signal, label='Signal')
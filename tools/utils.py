@@ -0,0 +1,9 @@
+def _parse_tickers(tickers):
+    if isinstance(tickers, str):
+        tickers = tickers.replace(";", ",").replace(" ", ",").split(",")
+    parsed = []
+    for t in tickers:
+        t = t.strip().upper()
+        if t and t not in parsed:
+            parsed.append(t)
+    return parsed